@@ -1,29 +1,52 @@
 from flask import Flask, request, jsonify, send_from_directory, render_template
 from flask_cors import CORS
+from flask.json.provider import DefaultJSONProvider
 import os
 import json
+import orjson
+import diskcache
 import requests
 from datetime import datetime
 import pytz
-import pandas as pd
-import numpy as np
-import yfinance as yf
 import logging
 from datetime import datetime, timedelta
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type, RetryError # Import RetryError
+from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception, RetryError # Import RetryError
 import time # Import the time module
+import threading
+from collections import OrderedDict
+import bisect
+import math
+from concurrent.futures import ThreadPoolExecutor
 
 # Load environment variables from .env file (even if no specific keys are used now, it's good practice)
 # from dotenv import load_dotenv # Uncomment if you decide to use .env for API keys
 # load_dotenv() # Uncomment if you decide to use .env for API keys
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, which is much faster than stdlib json for the numeric-heavy stock payloads."""
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        option = self._OPTIONS | (orjson.OPT_INDENT_2 if kwargs.get('indent') else 0)
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=self._OPTIONS), mimetype=self.mimetype)
+
 app = Flask(__name__,
             template_folder='templates',
             static_folder='static')
+app.json = OrjsonProvider(app)
 CORS(app)
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s') # MODIFIED LINE: Changed to DEBUG
+# Defaults to DEBUG for local development; set LOG_LEVEL (e.g. INFO) to quiet it in production
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'DEBUG').upper(), format='%(asctime)s - %(levelname)s - %(message)s')
 
 WATCHLIST_FILE = 'watchlist.json'
 DEFAULT_STOCKS_FILE = 'default_stocks.json'
@@ -32,424 +55,729 @@ DEFAULT_STOCKS_FILE = 'default_stocks.json'
 DEFAULT_COMPANY_TICKERS = ["AAPL", "MSFT", "GOOGL"]
 DEFAULT_INDEX_FUNDS = ["SPY", "QQQ", "DIA"] # Not directly used in analysis but kept for default list
 
-# Caching for yfinance data to reduce API calls for frequent requests
-STOCK_DATA_CACHE = {}
+# Caching for yfinance data to reduce API calls for frequent requests.
+# Backed by disk so it survives restarts and is shared between worker processes.
+STOCK_CACHE_DIR = './stockcache'
 CACHE_EXPIRATION_SECONDS = 3600 * 4 # Cache data for 4 hours
+STOCK_DATA_CACHE = diskcache.Cache(STOCK_CACHE_DIR, size_limit=64 << 20) # 64 MB cap, least-recently-stored entries evicted first
+# In-process front for STOCK_DATA_CACHE so warm hits skip the disk read and unpickle:
+# cache key -> {'data': stock_data, 'expires_at': time.monotonic() deadline}
+# Bounded LRU: least recently used entries are evicted once MEMORY_CACHE_MAX_ENTRIES is exceeded
+MEMORY_CACHE_MAX_ENTRIES = 128
+_MEMORY_CACHE = OrderedDict()
+_memory_cache_lock = threading.Lock() # OrderedDict reordering/eviction isn't atomic across request threads
+# Bump whenever the shape or scoring of cached stock_data changes, so entries persisted by an older version are ignored
+STOCK_CACHE_VERSION = 5
+
+# Columns of the daily history sent to the frontend, in order.
+# DateEpoch is the trading date as Unix seconds at UTC midnight (the frontend formats it for display).
+HISTORY_COLUMNS = ('DateEpoch', 'Open', 'High', 'Low', 'Close', 'Volume')
+
+# Client-side throttle for yfinance: only back-to-back calls wait, and only for what's left of the interval
+YFINANCE_MIN_INTERVAL_SECONDS = 1.5
+_last_call_ts = 0.0
+_rate_lock = threading.Lock()
+
+# Circuit breaker for Yahoo rate limiting: after BREAKER_FAILURE_THRESHOLD consecutive 429s, skip fetching
+# for BREAKER_COOLDOWN_SECONDS and serve stale cached data instead of piling up retries.
+# Only info fetches feed the breaker: yf.download() reports per-ticker failures internally rather than raising,
+# so 429s on the batched history download in fetch_many_from_yfinance are not counted.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_SECONDS = 120
+# Oldest data (seconds past its cache expiry) the breaker will still serve; older entries are dropped
+STALE_FALLBACK_MAX_SECONDS = 3600 * 24
+_breaker = {'failures': 0, 'open_until': 0.0}
+_breaker_lock = threading.Lock()
+
+# Shared worker pool for fanning out multi-ticker fetches (network I/O bound, so threads overlap well)
+EXECUTOR_MAX_WORKERS = 8
+EXECUTOR = ThreadPoolExecutor(max_workers=EXECUTOR_MAX_WORKERS)
+# yf.download() fires its per-ticker history requests past the rate limiter, so keep its fan-out no wider than EXECUTOR's
+BATCH_DOWNLOAD_THREADS = EXECUTOR_MAX_WORKERS
+# Cap on tickers per /api/stock_data_batch request; every uncached ticker takes a turn on the shared rate limiter
+MAX_BATCH_TICKERS = 50
+
+# In-memory copy of the watchlist; loaded from disk once and written through on every change
+_WATCHLIST_MEM = None
+_watchlist_lock = threading.RLock() # Guards read-modify-write of the watchlist across request threads
+
+# stock_data field -> yfinance info key, for values copied through unchanged
+_INFO_FIELD_MAP = {
+    'currentPrice': 'currentPrice',
+    'openPrice': 'open',
+    'previousClose': 'previousClose',
+    'dayHigh': 'dayHigh',
+    'dayLow': 'dayLow',
+    'volume': 'volume',
+    'marketCap': 'marketCap',
+    'currency': 'currency',
+    'industry': 'industry',
+    'sector': 'sector',
+    'fullTimeEmployees': 'fullTimeEmployees',
+    'weburl': 'website',
+    'peRatio': 'trailingPE',
+    'forwardPE': 'forwardPE',
+    'dividendYield': 'dividendYield',
+    'beta': 'beta',
+    '52WeekHigh': 'fiftyTwoWeekHigh',
+    '52WeekLow': 'fiftyTwoWeekLow',
+    'exDividendDate': 'exDividendDate', # This is a timestamp, converted to a date string after the copy
+    'analystTargetPrice': 'targetMeanPrice',
+}
+_INFO_FIELD_NAMES = tuple(_INFO_FIELD_MAP)
+_INFO_KEYS = tuple(_INFO_FIELD_MAP.values())
+
+# yfinance recommendationKey -> display label. Labels without an _ANALYST_RATING_SCORES entry
+# ('Outperform', 'Underperform', 'Data Unavailable') score as neutral. Unlisted keys fall back to title-casing.
+_RECOMMENDATION_LABELS = {
+    'strong_buy': 'Strong Buy',
+    'buy': 'Buy',
+    'outperform': 'Outperform',
+    'hold': 'Hold',
+    'underperform': 'Underperform',
+    'sell': 'Sell',
+    'strong_sell': 'Strong Sell',
+    'none': 'Data Unavailable', # Yahoo's placeholder when there is no analyst consensus
+}
 
 def load_watchlist():
-    """Loads the watchlist from a JSON file. Initializes an empty list if file not found or corrupted."""
-    if os.path.exists(WATCHLIST_FILE):
-        with open(WATCHLIST_FILE, 'r') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                logging.warning(f"{WATCHLIST_FILE} is empty or malformed. Initializing empty watchlist.")
-                return []
-    return []
+    """Returns the watchlist, reading the JSON file only on first use. Initializes an empty list if file not found or corrupted."""
+    global _WATCHLIST_MEM
+    with _watchlist_lock:
+        if _WATCHLIST_MEM is None:
+            _WATCHLIST_MEM = []
+            if os.path.exists(WATCHLIST_FILE):
+                with open(WATCHLIST_FILE, 'rb') as f:
+                    try:
+                        _WATCHLIST_MEM = orjson.loads(f.read())
+                    except orjson.JSONDecodeError:
+                        logging.warning(f"{WATCHLIST_FILE} is empty or malformed. Initializing empty watchlist.")
+        return list(_WATCHLIST_MEM)
 
 def save_watchlist(watchlist):
-    """Saves the current watchlist to a JSON file."""
-    with open(WATCHLIST_FILE, 'w') as f:
-        json.dump(watchlist, f, indent=4)
+    """Saves the watchlist to memory and atomically to the JSON file (write to a temp file, then replace)."""
+    global _WATCHLIST_MEM
+    with _watchlist_lock:
+        tmp_file = f"{WATCHLIST_FILE}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(watchlist, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, WATCHLIST_FILE)
+        _WATCHLIST_MEM = list(watchlist)
 
 def load_default_stocks():
     """Loads default stocks from a JSON file. Initializes with defaults if file not found."""
     if os.path.exists(DEFAULT_STOCKS_FILE):
-        with open(DEFAULT_STOCKS_FILE, 'r') as f:
+        with open(DEFAULT_STOCKS_FILE, 'rb') as f:
             try:
-                data = json.load(f)
+                data = orjson.loads(f.read())
                 return data.get("companies", []), data.get("index_funds", [])
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logging.warning(f"{DEFAULT_STOCKS_FILE} is empty or malformed. Initializing default stocks.")
                 return DEFAULT_COMPANY_TICKERS, DEFAULT_INDEX_FUNDS
     # If file doesn't exist, create it with defaults
-    with open(DEFAULT_STOCKS_FILE, 'w') as f:
-        json.dump({
+    with open(DEFAULT_STOCKS_FILE, 'wb') as f:
+        f.write(orjson.dumps({
             "companies": DEFAULT_COMPANY_TICKERS,
             "index_funds": DEFAULT_INDEX_FUNDS
-        }, f, indent=4)
+        }, option=orjson.OPT_INDENT_2))
     return DEFAULT_COMPANY_TICKERS, DEFAULT_INDEX_FUNDS
 
+def _cache_key(ticker):
+    """Key for a ticker's entry in STOCK_DATA_CACHE."""
+    return f"v{STOCK_CACHE_VERSION}:{ticker}"
+
+def _memory_cache_put(key, stock_data, expires_at):
+    """Inserts into the in-memory LRU, evicting the least recently used entries beyond the cap."""
+    with _memory_cache_lock:
+        _MEMORY_CACHE[key] = {'data': stock_data, 'expires_at': expires_at}
+        _MEMORY_CACHE.move_to_end(key)
+        while len(_MEMORY_CACHE) > MEMORY_CACHE_MAX_ENTRIES:
+            _MEMORY_CACHE.popitem(last=False)
+
+def _cache_get(ticker):
+    """Returns cached stock_data for ticker, or None if it is missing or expired."""
+    key = _cache_key(ticker)
+    with _memory_cache_lock:
+        entry = _MEMORY_CACHE.get(key)
+        if entry is not None and time.monotonic() < entry['expires_at']:
+            _MEMORY_CACHE.move_to_end(key)
+            return entry['data']
+    # Fall back to the disk cache (e.g. after a restart); expired entries are dropped by the cache itself
+    data, expire_time = STOCK_DATA_CACHE.get(key, expire_time=True)
+    if data is None:
+        # A recently expired memory entry is kept for _cache_get_stale; one past the stale window is dropped
+        with _memory_cache_lock:
+            if entry is not None and time.monotonic() - entry['expires_at'] > STALE_FALLBACK_MAX_SECONDS:
+                _MEMORY_CACHE.pop(key, None)
+        return None
+    # Keep the disk entry's remaining lifetime rather than restarting the TTL
+    remaining = CACHE_EXPIRATION_SECONDS if expire_time is None else expire_time - time.time()
+    _memory_cache_put(key, data, time.monotonic() + remaining)
+    return data
+
+def _cache_get_stale(ticker):
+    """
+    Returns the last stock_data this process cached for ticker, even if expired, or None.
+    Entries more than STALE_FALLBACK_MAX_SECONDS past expiry are too old to serve and are dropped.
+    """
+    key = _cache_key(ticker)
+    with _memory_cache_lock:
+        entry = _MEMORY_CACHE.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry['expires_at'] > STALE_FALLBACK_MAX_SECONDS:
+            _MEMORY_CACHE.pop(key)
+            return None
+        return entry['data']
+
+def _cache_set(ticker, stock_data):
+    """Stores stock_data for ticker in both the memory and disk caches."""
+    key = _cache_key(ticker)
+    STOCK_DATA_CACHE.set(key, stock_data, expire=CACHE_EXPIRATION_SECONDS)
+    _memory_cache_put(key, stock_data, time.monotonic() + CACHE_EXPIRATION_SECONDS)
+
+def _wait_for_rate_limit():
+    """Blocks just long enough to keep yfinance calls at least YFINANCE_MIN_INTERVAL_SECONDS apart."""
+    global _last_call_ts
+    with _rate_lock:
+        wait = max(0.0, YFINANCE_MIN_INTERVAL_SECONDS - (time.monotonic() - _last_call_ts))
+        if wait > 0:
+            time.sleep(wait)
+        _last_call_ts = time.monotonic()
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling yfinance while the rate-limit circuit breaker is open."""
+
+def _breaker_open():
+    """True while fetches are paused after repeated rate limiting."""
+    return time.monotonic() < _breaker['open_until']
+
+def _is_rate_limit_error(e):
+    """True if e is Yahoo telling us to back off (HTTP 429)."""
+    if isinstance(e, requests.exceptions.HTTPError):
+        return e.response is not None and e.response.status_code == 429
+    from yfinance.exceptions import YFRateLimitError # yfinance is already imported by the time a fetch fails
+    return isinstance(e, YFRateLimitError)
+
+def _record_fetch_result(rate_limited):
+    """Updates the circuit breaker after a yfinance call, opening it on repeated 429s."""
+    with _breaker_lock:
+        if not rate_limited:
+            _breaker['failures'] = 0
+            return
+        _breaker['failures'] += 1
+        if _breaker['failures'] >= BREAKER_FAILURE_THRESHOLD:
+            _breaker['open_until'] = time.monotonic() + BREAKER_COOLDOWN_SECONDS
+            _breaker['failures'] = 0
+            logging.warning(f"Rate limited by Yahoo Finance {BREAKER_FAILURE_THRESHOLD} times in a row. Pausing fetches for {BREAKER_COOLDOWN_SECONDS}s.")
+
+def _breaker_fallback(ticker):
+    """Result for a ticker that can't be fetched while the breaker is open: stale cached data if any."""
+    message = f"Yahoo Finance is rate limiting requests; fetching {ticker} is paused. Please try again later."
+    stale_data = _cache_get_stale(ticker)
+    if stale_data is not None:
+        logging.info(f"Serving stale {ticker} data from cache while the circuit breaker is open.")
+        return stale_data, [f"{message} Showing previously cached data."]
+    return {}, [message]
+
 def get_current_est_time():
     """Get current time in EST/EDT."""
     est = pytz.timezone('America/New_York')
     return datetime.now(est)
 
+def _is_retryable_error(e):
+    """True for errors worth retrying: HTTP errors, yfinance rate limiting (429), JSON errors, and the custom ValueError for empty info."""
+    return isinstance(e, (requests.exceptions.HTTPError, json.JSONDecodeError, ValueError)) or _is_rate_limit_error(e)
+
 # Helper function to fetch yfinance info with retry logic
 @retry(wait=wait_exponential(multiplier=1, min=4, max=10), # Start with 4s, max 10s delay
        stop=stop_after_attempt(5), # Try up to 5 times
-       retry=retry_if_exception_type((requests.exceptions.HTTPError, json.JSONDecodeError, ValueError))) # Retry on HTTP errors (like 429), JSON errors, and custom ValueError for empty info
+       retry=retry_if_exception(_is_retryable_error))
 def _fetch_yfinance_info_with_retry(ticker_obj):
     """
     Helper function to fetch yfinance info with retry logic for specific errors.
     Raises ValueError if info is empty after fetching.
     """
-    info = ticker_obj.info
-    logging.debug(f"Raw yfinance info for {ticker_obj.ticker}: {info}") # ADDED LINE
+    if _breaker_open(): # Stop retrying as soon as the breaker trips
+        raise CircuitOpenError("Circuit breaker is open after repeated rate limiting.")
+    _wait_for_rate_limit() # Throttle every attempt, including tenacity retries
+    try:
+        info = ticker_obj.info
+    except Exception as e:
+        _record_fetch_result(rate_limited=_is_rate_limit_error(e))
+        raise
+    _record_fetch_result(rate_limited=False)
+    # Guarded: repr() of the full info dict is large and would be built even when DEBUG is off
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("Raw yfinance info for %s: %s", ticker_obj.ticker, info)
     if not info:
         # If info is empty but no explicit exception, still treat as a failure for retry purposes
         raise ValueError("Yfinance returned empty info data.")
     return info
 
+def _fetch_info(ticker, ticker_obj):
+    """
+    Fetches the yfinance info dict for one ticker via the retry helper.
+    Returns (info, errors); info is None if the fetch ultimately failed.
+    """
+    errors = []
+    try:
+        return _fetch_yfinance_info_with_retry(ticker_obj), errors
+    except RetryError as re: # Catch the specific RetryError from tenacity if all retries fail
+        last_exception = re.last_attempt.exception()
+        if _is_rate_limit_error(last_exception):
+            errors.append(f"Rate limit hit for {ticker} (429 Too Many Requests) after multiple retries. Please try again later.")
+        elif isinstance(last_exception, json.JSONDecodeError):
+            errors.append(f"JSON decode error for {ticker}. Invalid response from yfinance after multiple retries. Error: {last_exception}")
+        elif isinstance(last_exception, ValueError):
+             errors.append(f"No info data found for {ticker} after multiple retries. Error: {last_exception}")
+        else:
+            errors.append(f"Failed to retrieve info for {ticker} after multiple retries. Last error: {last_exception}")
+        logging.error(f"Failed to retrieve info for {ticker} after retries: {last_exception}")
+    except CircuitOpenError: # Breaker tripped while this fetch was retrying; callers fall back via _breaker_fallback
+        errors.append(f"Fetching {ticker} was paused because Yahoo Finance is rate limiting requests.")
+    except Exception as e: # Catch any other unexpected errors not handled by retry
+        if _is_rate_limit_error(e):
+            errors.append(f"Rate limit hit for {ticker} (429 Too Many Requests). Please try again later.")
+            logging.error(f"Rate limited during yfinance info fetch for {ticker}: {e}")
+        else:
+            errors.append(f"An unexpected error occurred while fetching info for {ticker}: {e}")
+            logging.error(f"Unexpected error during yfinance info fetch for {ticker}: {e}")
+    return None, errors
+
+def _build_stock_data(ticker, info, history_df):
+    """
+    Turns a yfinance info dict and 1-year daily history DataFrame into our stock_data dict.
+    Returns (stock_data, errors).
+    """
+    stock_data = {}
+    errors = []
+
+    # Basic Info and Financial Ratios: straight copies from yfinance info, renamed in one pass
+    stock_data['ticker'] = ticker
+    stock_data['companyName'] = info.get('longName') or info.get('shortName', 'N/A')
+    stock_data.update(zip(_INFO_FIELD_NAMES, map(info.get, _INFO_KEYS)))
+    stock_data['businessSummary'] = info.get('longBusinessSummary', 'No business summary available.')
+
+    # Price Change Calculation (using current price vs previous close)
+    if stock_data['currentPrice'] is not None and stock_data['previousClose'] is not None:
+        stock_data['priceChange'] = stock_data['currentPrice'] - stock_data['previousClose']
+        if stock_data['previousClose'] != 0:
+            stock_data['percentChange'] = (stock_data['priceChange'] / stock_data['previousClose']) * 100
+        else:
+            stock_data['percentChange'] = 0
+    else:
+        stock_data['priceChange'] = None
+        stock_data['percentChange'] = None
+
+    # Convert exDividendDate from timestamp to readable date if available
+    if isinstance(stock_data['exDividendDate'], (int, float)):
+        try:
+            stock_data['exDividendDate'] = datetime.fromtimestamp(stock_data['exDividendDate'], tz=pytz.utc).strftime('%Y-%m-%d')
+        except (TypeError, ValueError):
+            stock_data['exDividendDate'] = None # Invalid timestamp
+
+    # IPO Date (using start_date from YF history if available, or firstTradeDate from info)
+    ipo_date = info.get('firstTradeDateEpochUtc')
+    if ipo_date:
+        try:
+            stock_data['ipo'] = datetime.fromtimestamp(ipo_date, tz=pytz.utc).strftime('%Y-%m-%d')
+        except (TypeError, ValueError):
+            stock_data['ipo'] = 'N/A'
+    else:
+        stock_data['ipo'] = 'N/A' # Fallback
+
+    # Analyst Recommendations (from info directly, or mock if not available)
+    recommendation_key = info.get('recommendationKey')
+    stock_data['analystRecommendation'] = _RECOMMENDATION_LABELS.get(recommendation_key) or \
+        (recommendation_key.replace('_', ' ').title() if isinstance(recommendation_key, str) else 'Data Unavailable')
+
+    # Calculate analyst upside using target price and current price
+    if stock_data['analystTargetPrice'] and stock_data['currentPrice'] and stock_data['currentPrice'] != 0:
+        stock_data['analystUpside'] = (stock_data['analystTargetPrice'] - stock_data['currentPrice']) / stock_data['currentPrice']
+    else:
+        stock_data['analystUpside'] = None
+
+    # Historical data for charting (last 1 year), columnar: one list per column rather than one dict per day.
+    # Also reduced to the scalars the technical analysis score uses.
+    stock_data['historicalData'] = {col: [] for col in HISTORY_COLUMNS}
+    stock_data['techFeatures'] = compute_tech_features(history_df['Close'].to_numpy(dtype='float64') if not history_df.empty else None)
+    if not history_df.empty:
+        # One vectorized conversion instead of a per-row strftime. Dropping the exchange timezone first keeps
+        # the wall-clock date, so each value is the trading date at UTC midnight regardless of exchange.
+        history_df = history_df.assign(DateEpoch=history_df.index.tz_localize(None).to_numpy(dtype='datetime64[s]').astype('int64'))
+        stock_data['historicalData'] = {col: history_df[col].tolist() for col in HISTORY_COLUMNS}
+    else:
+        errors.append(f"No historical data found for {ticker}.")
+
+    return stock_data, errors
+
+def _store_fetched(ticker, stock_data, errors):
+    """Scores a successful fetch result, caches it and returns (stock_data, errors)."""
+    if not stock_data and not errors: # If stock_data is empty and no explicit errors logged, means general failure
+         errors.append(f"Could not retrieve any data for {ticker}. It might be an invalid ticker or temporarily unavailable.")
+
+    # Score once and cache the analyzed result if successful; the inputs are frozen for the cache lifetime,
+    # so cache hits can be returned without rescoring
+    if stock_data:
+        stock_data = calculate_overall_score_and_reasons(stock_data)
+        _cache_set(ticker, stock_data)
+    # Guarded: the payload includes the full historicalData, so only format it when DEBUG is on
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("Final processed stock_data for %s: %s", ticker, stock_data)
+    return stock_data, errors
+
 def fetch_stock_data_from_yfinance(ticker):
     """
-    Fetches comprehensive stock data for a given ticker using yfinance.
-    Includes caching mechanism and retry logic.
+    Fetches comprehensive stock data for a given ticker using yfinance, already scored by
+    calculate_overall_score_and_reasons. Includes caching mechanism and retry logic.
     """
-    current_time = datetime.now()
-    if ticker in STOCK_DATA_CACHE and \
-       (current_time - STOCK_DATA_CACHE[ticker]['timestamp']).total_seconds() < CACHE_EXPIRATION_SECONDS:
+    cached_data = _cache_get(ticker)
+    if cached_data is not None:
         logging.info(f"Serving {ticker} data from cache.")
-        return STOCK_DATA_CACHE[ticker]['data'], []
+        return cached_data, []
+    if _breaker_open():
+        return _breaker_fallback(ticker)
 
     logging.info(f"Fetching fresh data for {ticker} from yfinance.")
-    
-    # Introduce a small delay before fetching to mitigate rate limiting
-    # This acts as a client-side throttle for individual requests.
-    time.sleep(30) # Increased wait to 30 seconds as requested
+    # Imported lazily: yfinance drags in pandas/numpy, which only the fetch path needs, so startup and
+    # the watchlist/default-stocks endpoints don't pay for them (sys.modules caches it after the first call)
+    import yfinance as yf
 
     stock_data = {}
     errors = []
 
     try:
         ticker_obj = yf.Ticker(ticker)
-        
-        # Fetch info using the retry helper
-        try:
-            info = _fetch_yfinance_info_with_retry(ticker_obj)
-        except RetryError as re: # Catch the specific RetryError from tenacity if all retries fail
-            last_exception = re.last_attempt.exception()
-            if isinstance(last_exception, requests.exceptions.HTTPError) and last_exception.response.status_code == 429:
-                errors.append(f"Rate limit hit for {ticker} (429 Too Many Requests) after multiple retries. Please try again later.")
-            elif isinstance(last_exception, json.JSONDecodeError):
-                errors.append(f"JSON decode error for {ticker}. Invalid response from yfinance after multiple retries. Error: {last_exception}")
-            elif isinstance(last_exception, ValueError):
-                 errors.append(f"No info data found for {ticker} after multiple retries. Error: {last_exception}")
-            else:
-                errors.append(f"Failed to retrieve info for {ticker} after multiple retries. Last error: {last_exception}")
-            logging.error(f"Failed to retrieve info for {ticker} after retries: {last_exception}")
-            return {}, errors
-        except Exception as e: # Catch any other unexpected errors not handled by retry
-            errors.append(f"An unexpected error occurred while fetching info for {ticker}: {e}")
-            logging.error(f"Unexpected error during yfinance info fetch for {ticker}: {e}")
-            return {}, errors
-
-        # Basic Info
-        stock_data['ticker'] = ticker
-        stock_data['companyName'] = info.get('longName') or info.get('shortName', 'N/A')
-        stock_data['currentPrice'] = info.get('currentPrice')
-        stock_data['openPrice'] = info.get('open')
-        stock_data['previousClose'] = info.get('previousClose')
-        stock_data['dayHigh'] = info.get('dayHigh')
-        stock_data['dayLow'] = info.get('dayLow')
-        stock_data['volume'] = info.get('volume')
-        stock_data['marketCap'] = info.get('marketCap')
-        stock_data['currency'] = info.get('currency')
-        stock_data['industry'] = info.get('industry')
-        stock_data['sector'] = info.get('sector')
-        stock_data['fullTimeEmployees'] = info.get('fullTimeEmployees')
-        stock_data['businessSummary'] = info.get('longBusinessSummary', 'No business summary available.')
-        stock_data['weburl'] = info.get('website')
-
-        # Price Change Calculation (using current price vs previous close)
-        if stock_data['currentPrice'] is not None and stock_data['previousClose'] is not None:
-            stock_data['priceChange'] = stock_data['currentPrice'] - stock_data['previousClose']
-            if stock_data['previousClose'] != 0:
-                stock_data['percentChange'] = (stock_data['priceChange'] / stock_data['previousClose']) * 100
-            else:
-                stock_data['percentChange'] = 0
-        else:
-            stock_data['priceChange'] = None
-            stock_data['percentChange'] = None
-
-        # Financial Ratios
-        stock_data['peRatio'] = info.get('trailingPE')
-        stock_data['forwardPE'] = info.get('forwardPE')
-        stock_data['dividendYield'] = info.get('dividendYield')
-        stock_data['beta'] = info.get('beta')
-        stock_data['52WeekHigh'] = info.get('fiftyTwoWeekHigh')
-        stock_data['52WeekLow'] = info.get('fiftyTwoWeekLow')
-        stock_data['exDividendDate'] = info.get('exDividendDate') # This is a timestamp, will need conversion
-
-        # Convert exDividendDate from timestamp to readable date if available
-        if isinstance(stock_data['exDividendDate'], (int, float)):
-            try:
-                stock_data['exDividendDate'] = datetime.fromtimestamp(stock_data['exDividendDate'], tz=pytz.utc).strftime('%Y-%m-%d')
-            except (TypeError, ValueError):
-                stock_data['exDividendDate'] = None # Invalid timestamp
 
-        # IPO Date (using start_date from YF history if available, or firstTradeDate from info)
-        ipo_date = info.get('firstTradeDateEpochUtc')
-        if ipo_date:
-            try:
-                stock_data['ipo'] = datetime.fromtimestamp(ipo_date, tz=pytz.utc).strftime('%Y-%m-%d')
-            except (TypeError, ValueError):
-                stock_data['ipo'] = 'N/A'
-        else:
-            stock_data['ipo'] = 'N/A' # Fallback
-
-        # Analyst Recommendations (from info directly, or mock if not available)
-        stock_data['analystRecommendation'] = info.get('recommendationKey', 'Data Unavailable').replace('_', ' ').title()
-        stock_data['analystTargetPrice'] = info.get('targetMeanPrice')
-
-        # Calculate analyst upside using target price and current price
-        if stock_data['analystTargetPrice'] and stock_data['currentPrice'] and stock_data['currentPrice'] != 0:
-            stock_data['analystUpside'] = (stock_data['analystTargetPrice'] - stock_data['currentPrice']) / stock_data['currentPrice']
-        else:
-            stock_data['analystUpside'] = None
+        # Fetch info using the retry helper
+        info, errors = _fetch_info(ticker, ticker_obj)
+        if info is None:
+            return _breaker_fallback(ticker) if _breaker_open() else ({}, errors)
 
-        # Fetch historical data for charting (last 1 year) - this will still be fetched by backend
-        # even if frontend doesn't chart it. It's used for technical analysis score.
+        # Fetch historical data (last 1 year) for the chart and technical analysis score
         history_df = ticker_obj.history(period="1y")
-        stock_data['historicalData'] = []
-        if not history_df.empty:
-            history_df.reset_index(inplace=True)
-            history_df['Date'] = history_df['Date'].dt.strftime('%Y-%m-%d')
-            stock_data['historicalData'] = history_df[['Date', 'Open', 'High', 'Low', 'Close', 'Volume']].to_dict(orient='records')
-        else:
-            errors.append(f"No historical data found for {ticker}.")
+        stock_data, errors = _build_stock_data(ticker, info, history_df)
 
     except Exception as e:
         logging.error(f"Error fetching data for {ticker} from yfinance: {e}")
         errors.append(f"yfinance data fetch error: {e}")
         stock_data = {} # Clear partial data if a major error occurs
 
-    if not stock_data and not errors: # If stock_data is empty and no explicit errors logged, means general failure
-         errors.append(f"Could not retrieve any data for {ticker}. It might be an invalid ticker or temporarily unavailable.")
+    return _store_fetched(ticker, stock_data, errors)
 
-    # Cache the result if successful
-    if stock_data:
-        STOCK_DATA_CACHE[ticker] = {
-            'data': stock_data,
-            'timestamp': current_time
-        }
-    logging.debug(f"Final processed stock_data for {ticker}: {stock_data}") # ADDED LINE
-    return stock_data, errors
+def _history_for_ticker(history, ticker):
+    """Extracts one ticker's rows from a yf.download(..., group_by='ticker') DataFrame."""
+    symbol = ticker.upper() # yfinance upper-cases symbols
+    if history.columns.nlevels > 1:
+        if symbol not in history.columns.get_level_values(0):
+            return history.iloc[0:0]
+        history = history[symbol]
+    # download() aligns all tickers on one date index; drop the days this ticker has no data for
+    return history.dropna(how='all')
 
-def calculate_analyst_rating_score(recommendation):
-    """Calculates a score (0-100) based on analyst recommendation."""
-    if recommendation == "Strong Buy":
-        return 100, "Analysts strongly recommend buying based on consensus ratings."
-    elif recommendation == "Buy":
-        return 80, "Analysts generally recommend buying."
-    elif recommendation == "Hold":
-        return 50, "Analysts suggest holding, expecting modest performance."
-    elif recommendation == "Sell":
-        return 20, "Analysts recommend selling due to anticipated underperformance."
-    elif recommendation == "Strong Sell":
-        return 0, "Analysts strongly recommend selling due to significant concerns."
-    return 50, "Analyst recommendation data unavailable or neutral." # Neutral if unknown/unavailable
-
-def calculate_analyst_upside_score(upside_percent):
-    """Calculates a score (0-100) based on analyst upside percentage with tiered logic."""
-    if upside_percent is None or not isinstance(upside_percent, (int, float)):
-        return 50, "Analyst target price or upside data not available." # Neutral if no data
-    
-    # Tiered scoring for upside
-    if upside_percent >= 0.25: # 25% or more
-        return 100, f"Significant upside potential of {(upside_percent * 100):.2f}% according to target prices."
-    elif upside_percent >= 0.15: # 15% to 24.99%
-        return 90, f"High upside potential of {(upside_percent * 100):.2f}% based on target prices."
-    elif upside_percent >= 0.08: # 8% to 14.99%
-        return 75, f"Moderate upside potential of {(upside_percent * 100):.2f}% based on target prices."
-    elif upside_percent >= 0.02: # 2% to 7.99%
-        return 60, f"Modest upside potential of {(upside_percent * 100):.2f}% based on target prices."
-    elif upside_percent >= -0.05: # -5% to 1.99% (slight downside or flat)
-        return 40, f"Limited upside or slight downside of {(upside_percent * 100):.2f}% based on target prices."
-    else: # More than 5% downside
-        return 10, f"Significant downside risk of {(upside_percent * 100):.2f}% based on target prices."
-
-def calculate_financial_analysis_score(info):
+def fetch_many_from_yfinance(tickers):
     """
-    Calculates a score (0-100) based on key financial metrics.
-    Includes more metrics for a robust score.
+    Fetches stock data for several tickers, batching the yfinance calls.
+    Cached tickers are served from cache; the 1-year history of all remaining tickers comes from a single
+    yf.download() call and their info dicts are fetched concurrently on EXECUTOR.
+    Returns a list of (stock_data, errors) in the same order as tickers.
     """
-    score = 0
-    reasons = []
-
-    pe_ratio = info.get('trailingPE')
-    forward_pe = info.get('forwardPE')
-    dividend_yield = info.get('dividendYield')
-    market_cap = info.get('marketCap')
-    beta = info.get('beta')
-    
+    results = {}
+    missing = []
+    for ticker in tickers:
+        cached_data = _cache_get(ticker)
+        if cached_data is not None:
+            logging.info(f"Serving {ticker} data from cache.")
+            results[ticker] = (cached_data, [])
+        elif _breaker_open():
+            results[ticker] = _breaker_fallback(ticker)
+        else:
+            missing.append(ticker)
+
+    if missing:
+        logging.info(f"Fetching fresh data for {', '.join(missing)} from yfinance.")
+        import yfinance as yf # Imported lazily, see fetch_stock_data_from_yfinance
+
+        try:
+            tickers_obj = yf.Tickers(missing) # Pass the list so symbols aren't re-split on spaces/commas
+            _wait_for_rate_limit()
+            history = yf.download(missing, period='1y', group_by='ticker', threads=min(len(missing), BATCH_DOWNLOAD_THREADS), progress=False)
+        except Exception as e:
+            logging.error(f"Error fetching batch history for {', '.join(missing)} from yfinance: {e}")
+            for ticker in missing:
+                results[ticker] = ({}, [f"yfinance data fetch error: {e}"])
+            return [results[ticker] for ticker in tickers]
+
+        def fetch_batch_info(ticker):
+            # Any failure here must stay confined to this ticker's ({}, errors) entry, never the whole batch
+            ticker_obj = tickers_obj.tickers.get(ticker.upper())
+            if ticker_obj is None:
+                return None, [f"Could not set up a yfinance lookup for {ticker}."]
+            return _fetch_info(ticker, ticker_obj)
+
+        infos = EXECUTOR.map(fetch_batch_info, missing)
+        for ticker, (info, errors) in zip(missing, infos):
+            if info is None:
+                results[ticker] = _breaker_fallback(ticker) if _breaker_open() else ({}, errors)
+                continue
+            try:
+                stock_data, errors = _build_stock_data(ticker, info, _history_for_ticker(history, ticker))
+            except Exception as e:
+                logging.error(f"Error processing data for {ticker} from yfinance: {e}")
+                stock_data, errors = {}, [f"yfinance data fetch error: {e}"]
+            results[ticker] = _store_fetched(ticker, stock_data, errors)
+
+    return [results[ticker] for ticker in tickers]
+
+# --- Scoring Tables ---
+# Each tier table is (thresholds, scores, reasons): thresholds are sorted ascending and a value lands in
+# tier bisect_right(thresholds, value), so a value equal to a threshold falls into the higher tier.
+# Where the original rule was "<= x" the threshold is math.nextafter(x, math.inf) to keep x in the lower tier.
+
+_UPSIDE_TIERS = (
+    (-0.05, 0.02, 0.08, 0.15, 0.25),
+    (10, 40, 60, 75, 90, 100),
+    ("Significant downside risk of {pct:.2f}% based on target prices.", # More than 5% downside
+     "Limited upside or slight downside of {pct:.2f}% based on target prices.", # -5% to 1.99% (slight downside or flat)
+     "Modest upside potential of {pct:.2f}% based on target prices.", # 2% to 7.99%
+     "Moderate upside potential of {pct:.2f}% based on target prices.", # 8% to 14.99%
+     "High upside potential of {pct:.2f}% based on target prices.", # 15% to 24.99%
+     "Significant upside potential of {pct:.2f}% according to target prices."), # 25% or more
+)
+
+_PE_TIERS = (
+    (15, 25),
+    (25, 15, 5),
+    ("Healthy Trailing P/E Ratio ({value:.2f}) indicates good valuation.",
+     "Moderate Trailing P/E Ratio ({value:.2f}).",
+     "High Trailing P/E Ratio ({value:.2f}) suggests potential overvaluation or high growth expectations."),
+)
+
+_FORWARD_PE_TIERS = (
+    (15, 25),
+    (20, 10, 2),
+    ("Strong Forward P/E Ratio ({value:.2f}) suggests future earnings growth.",
+     "Moderate Forward P/E Ratio ({value:.2f}).",
+     "High Forward P/E Ratio ({value:.2f})."),
+)
+
+_DIVIDEND_TIERS = (
+    (0.01, 0.03),
+    (5, 10, 20),
+    ("Low Dividend Yield of {pct:.2f}%.",
+     "Modest Dividend Yield of {pct:.2f}%.", # 1% to <3%
+     "Attractive Dividend Yield of {pct:.2f}% provides income."), # 3% or more
+)
+
+_MARKET_CAP_TIERS = (
+    (2e9, 10e9, 200e9),
+    (0, 5, 10, 15),
+    ("Smaller market capitalization, potentially higher risk/reward.",
+     "Mid-cap company with potential for growth.",
+     "Solid large-cap market capitalization.",
+     "Large market capitalization suggests stability and market leadership."), # Mega-cap
+)
+
+_BETA_TIERS = (
+    (0.8, 1.2),
+    (20, 10, 5),
+    ("Low Beta ({value:.2f}) indicates lower volatility relative to the market.",
+     "Moderate Beta ({value:.2f}) suggests volatility in line with the market.",
+     "High Beta ({value:.2f}) implies higher volatility and potentially higher risk."),
+)
+
+# Position of the current price within its 52-week range (0 = at the low, 1 = at the high)
+_RANGE_POSITION_TIERS = (
+    (math.nextafter(0.1, math.inf), math.nextafter(0.3, math.inf), 0.7, 0.9),
+    (0, 5, 10, 20, 30),
+    ("Price is near 52-week low ({low:.2f}), indicating weakness.",
+     "Price is in the lower range of 52-week performance ({price:.2f}).",
+     "Price is in the mid-range of its 52-week performance ({price:.2f}).",
+     "Price is in the upper range of 52-week performance ({price:.2f}).",
+     "Price is near 52-week high ({high:.2f}), showing strong upward momentum."),
+)
+
+# Price change over roughly the last month of trading days
+_RECENT_CHANGE_TIERS = (
+    (math.nextafter(-0.05, math.inf), 0, 0.01, 0.05),
+    (0, 10, 15, 20, 30),
+    ("Weak recent performance: Price down {abs_pct:.2f}% over the last month.", # Lost 5% or more
+     "Slightly negative recent performance: Price down {abs_pct:.2f}% over the last month.", # Lost up to 5%
+     "Stable recent performance over the last month.",
+     "Positive recent performance: Price up {pct:.2f}% over the last month.", # Gained 1-5%
+     "Strong recent performance: Price up {pct:.2f}% over the last month."), # Gained 5% or more
+)
+
+def _score_tier(tiers, value, **fmt):
+    """Looks up value in a (thresholds, scores, reasons) tier table and returns (score, formatted reason)."""
+    thresholds, scores, reasons = tiers
+    idx = bisect.bisect_right(thresholds, value)
+    return scores[idx], reasons[idx].format(value=value, pct=value * 100, abs_pct=abs(value) * 100, **fmt)
+
+# Analyst recommendation -> (score, reason); anything else is treated as neutral
+_ANALYST_RATING_SCORES = {
+    "Strong Buy": (100, "Analysts strongly recommend buying based on consensus ratings."),
+    "Buy": (80, "Analysts generally recommend buying."),
+    "Hold": (50, "Analysts suggest holding, expecting modest performance."),
+    "Sell": (20, "Analysts recommend selling due to anticipated underperformance."),
+    "Strong Sell": (0, "Analysts strongly recommend selling due to significant concerns."),
+}
+_ANALYST_RATING_DEFAULT = (50, "Analyst recommendation data unavailable or neutral.") # Neutral if unknown/unavailable
+
+# Every stock_data field the scoring reads, fetched in one pass by score_all
+_SCORE_KEYS = ('analystRecommendation', 'analystUpside', 'peRatio', 'forwardPE', 'dividendYield',
+               'marketCap', 'beta', 'techFeatures', 'currentPrice', '52WeekHigh', '52WeekLow')
+
+def compute_tech_features(close_prices):
+    """
+    Reduces a chronologically ordered NumPy array of daily closes to the scalars the technical score needs.
+    Computed once at fetch time so scoring never has to revisit the full price history.
+    """
+    n = 0 if close_prices is None else len(close_prices)
+    return {
+        'dataPoints': n,
+        'ma50': float(close_prices[-50:].mean()) if n >= 50 else None,
+        'ma200': float(close_prices[-200:].mean()) if n >= 200 else None,
+        'lastClose': float(close_prices[-1]) if n >= 1 else None,
+        'close20DaysAgo': float(close_prices[-20]) if n >= 20 else None, # Approx one month of trading days
+    }
+
+def score_all(stock_data):
+    """
+    Scores analyst rating, analyst upside, financials and technicals in a single pass over stock_data.
+    Returns (score_breakdown, reasons) where reasons holds one summary line per category, in that order.
+    """
+    (analyst_recommendation, analyst_upside, pe_ratio, forward_pe, dividend_yield,
+     market_cap, beta, tech_features, current_price, fifty_two_week_high, fifty_two_week_low) = map(stock_data.get, _SCORE_KEYS)
+
+    # 1. Analyst Rating Score
+    analyst_rating_score, reason_ar = _ANALYST_RATING_SCORES.get(analyst_recommendation, _ANALYST_RATING_DEFAULT)
+
+    # 2. Analyst Upside Score
+    upside_ok = isinstance(analyst_upside, (int, float))
+    if upside_ok:
+        analyst_upside_score, reason_au = _score_tier(_UPSIDE_TIERS, analyst_upside)
+    else:
+        analyst_upside_score, reason_au = 50, "Analyst target price or upside data not available." # Neutral if no data
+
+    # 3. Financial Analysis Score (max possible with current weights: 25+20+20+15+20 = 100)
+    fa_score = 0
+    reasons_fa = []
+
     # PE Ratio (lower is generally better, but penalize negative or extremely high)
     if isinstance(pe_ratio, (int, float)) and pe_ratio > 0:
-        if pe_ratio < 15:
-            score += 25
-            reasons.append(f"Healthy Trailing P/E Ratio ({pe_ratio:.2f}) indicates good valuation.")
-        elif pe_ratio < 25:
-            score += 15
-            reasons.append(f"Moderate Trailing P/E Ratio ({pe_ratio:.2f}).")
-        else:
-            score += 5
-            reasons.append(f"High Trailing P/E Ratio ({pe_ratio:.2f}) suggests potential overvaluation or high growth expectations.")
+        points, reason = _score_tier(_PE_TIERS, pe_ratio)
+        fa_score += points
+        reasons_fa.append(reason)
     else:
-        reasons.append("Trailing P/E Ratio N/A or not positive, limiting valuation insight.")
+        reasons_fa.append("Trailing P/E Ratio N/A or not positive, limiting valuation insight.")
 
     # Forward PE Ratio
     if isinstance(forward_pe, (int, float)) and forward_pe > 0:
-        if forward_pe < 15:
-            score += 20
-            reasons.append(f"Strong Forward P/E Ratio ({forward_pe:.2f}) suggests future earnings growth.")
-        elif forward_pe < 25:
-            score += 10
-            reasons.append(f"Moderate Forward P/E Ratio ({forward_pe:.2f}).")
-        else:
-            score += 2
-            reasons.append(f"High Forward P/E Ratio ({forward_pe:.2f}).")
+        points, reason = _score_tier(_FORWARD_PE_TIERS, forward_pe)
+        fa_score += points
+        reasons_fa.append(reason)
     else:
-        reasons.append("Forward P/E Ratio N/A or not positive.")
+        reasons_fa.append("Forward P/E Ratio N/A or not positive.")
 
     # Dividend Yield (higher is better for income, 0 for non-dividend or negative for high risk)
     if isinstance(dividend_yield, (int, float)) and dividend_yield > 0:
-        if dividend_yield >= 0.03: # 3% or more
-            score += 20
-            reasons.append(f"Attractive Dividend Yield of {(dividend_yield * 100):.2f}% provides income.")
-        elif dividend_yield >= 0.01: # 1% to <3%
-            score += 10
-            reasons.append(f"Modest Dividend Yield of {(dividend_yield * 100):.2f}%.")
-        else:
-            score += 5
-            reasons.append(f"Low Dividend Yield of {(dividend_yield * 100):.2f}%.")
+        points, reason = _score_tier(_DIVIDEND_TIERS, dividend_yield)
+        fa_score += points
+        reasons_fa.append(reason)
     else:
-        reasons.append("No significant dividend yield, common for growth stocks or those reinvesting earnings.")
+        reasons_fa.append("No significant dividend yield, common for growth stocks or those reinvesting earnings.")
 
     # Market Cap (larger implies stability, but also slower growth) - Score based on being a substantial company
     if isinstance(market_cap, (int, float)) and market_cap > 0:
-        if market_cap >= 200e9: # Mega-cap
-            score += 15
-            reasons.append("Large market capitalization suggests stability and market leadership.")
-        elif market_cap >= 10e9: # Large-cap
-            score += 10
-            reasons.append("Solid large-cap market capitalization.")
-        elif market_cap >= 2e9: # Mid-cap
-            score += 5
-            reasons.append("Mid-cap company with potential for growth.")
-        else:
-            reasons.append("Smaller market capitalization, potentially higher risk/reward.")
+        points, reason = _score_tier(_MARKET_CAP_TIERS, market_cap)
+        fa_score += points
+        reasons_fa.append(reason)
     else:
-        reasons.append("Market capitalization data unavailable.")
+        reasons_fa.append("Market capitalization data unavailable.")
 
     # Beta (lower beta implies less volatility, which can be good for stability)
     if isinstance(beta, (int, float)):
-        if beta < 0.8:
-            score += 20
-            reasons.append(f"Low Beta ({beta:.2f}) indicates lower volatility relative to the market.")
-        elif beta < 1.2:
-            score += 10
-            reasons.append(f"Moderate Beta ({beta:.2f}) suggests volatility in line with the market.")
-        else:
-            score += 5
-            reasons.append(f"High Beta ({beta:.2f}) implies higher volatility and potentially higher risk.")
+        points, reason = _score_tier(_BETA_TIERS, beta)
+        fa_score += points
+        reasons_fa.append(reason)
     else:
-        reasons.append("Beta (market volatility) data unavailable.")
+        reasons_fa.append("Beta (market volatility) data unavailable.")
 
-    # Max possible score with current weights: 25+20+20+15+20 = 100
-    final_score = int(min(100, score)) # Cap at 100
-    if not reasons: reasons.append("Limited financial data available for comprehensive analysis.")
-    return final_score, reasons
-
-def calculate_technical_analysis_score(historical_data, current_price, fifty_two_week_high, fifty_two_week_low):
-    """
-    Calculates a score (0-100) based on technical indicators including MAs and 52-week range.
-    """
-    score = 0
-    reasons = []
+    financial_analysis_score = int(min(100, fa_score)) # Cap at 100
 
-    if not historical_data or len(historical_data) < 200: # Need enough data for 200-day MA
-        return 50, ["Insufficient historical data for comprehensive technical analysis (less than 200 days)."]
-
-    # Convert to pandas DataFrame for easier calculations
-    df = pd.DataFrame(historical_data)
-    # Ensure 'Date' is datetime and 'Close' is numeric
-    df['Date'] = pd.to_datetime(df['Date'])
-    df['Close'] = pd.to_numeric(df['Close'])
-    df = df.set_index('Date').sort_index()
-
-    if current_price is None or not isinstance(current_price, (int, float)):
-        # Fallback to last close if current_price is not explicitly provided
-        current_price = df['Close'].iloc[-1]
-        reasons.append("Using last available closing price for current price in technical analysis.")
+    # 4. Technical Analysis Score
+    ta_score = 0
+    reasons_ta = []
 
-    # Calculate Moving Averages
-    df['MA50'] = df['Close'].rolling(window=50).mean()
-    df['MA200'] = df['Close'].rolling(window=200).mean()
+    if not tech_features or tech_features['dataPoints'] < 200: # Need enough data for 200-day MA
+        ta_score = 50
+        reasons_ta.append("Insufficient historical data for comprehensive technical analysis (less than 200 days).")
+    else:
+        if current_price is None or not isinstance(current_price, (int, float)):
+            # Fallback to last close if current_price is not explicitly provided
+            current_price = tech_features['lastClose']
+            reasons_ta.append("Using last available closing price for current price in technical analysis.")
 
-    last_ma50 = df['MA50'].iloc[-1] if not df['MA50'].isnull().all() else None
-    last_ma200 = df['MA200'].iloc[-1] if not df['MA200'].isnull().all() else None
+        last_ma50 = tech_features['ma50']
+        last_ma200 = tech_features['ma200']
 
-    # MA Crossover Analysis (weight: 40 points)
-    if last_ma50 is not None and last_ma200 is not None:
+        # MA Crossover Analysis (weight: 40 points)
         if current_price > last_ma50 and current_price > last_ma200:
-            score += 40
-            reasons.append(f"Price ({current_price:.2f}) is above 50-day ({last_ma50:.2f}) and 200-day ({last_ma200:.2f}) moving averages (Bullish trend).")
+            ta_score += 40
+            reasons_ta.append(f"Price ({current_price:.2f}) is above 50-day ({last_ma50:.2f}) and 200-day ({last_ma200:.2f}) moving averages (Bullish trend).")
         elif current_price > last_ma50:
-            score += 25
-            reasons.append(f"Price ({current_price:.2f}) is above 50-day moving average ({last_ma50:.2f}) (Positive short-term momentum).")
+            ta_score += 25
+            reasons_ta.append(f"Price ({current_price:.2f}) is above 50-day moving average ({last_ma50:.2f}) (Positive short-term momentum).")
         elif current_price > last_ma200:
-            score += 15
-            reasons.append(f"Price ({current_price:.2f}) is above 200-day moving average ({last_ma200:.2f}) (Long-term trend support).")
+            ta_score += 15
+            reasons_ta.append(f"Price ({current_price:.2f}) is above 200-day moving average ({last_ma200:.2f}) (Long-term trend support).")
         else:
-            score += 5
-            reasons.append(f"Price ({current_price:.2f}) is below key moving averages, indicating bearish pressure.")
-    else:
-        reasons.append("Not enough data to calculate 50-day or 200-day moving averages.")
-
-    # 52-Week High/Low (weight: 30 points)
-    if fifty_two_week_high and fifty_two_week_low and current_price:
-        price_range = fifty_two_week_high - fifty_two_week_low
-        if price_range > 0:
-            position_in_range = (current_price - fifty_two_week_low) / price_range
-            if position_in_range >= 0.9:
-                score += 30
-                reasons.append(f"Price is near 52-week high ({fifty_two_week_high:.2f}), showing strong upward momentum.")
-            elif position_in_range >= 0.7:
-                score += 20
-                reasons.append(f"Price is in the upper range of 52-week performance ({current_price:.2f}).")
-            elif position_in_range <= 0.1:
-                score += 0
-                reasons.append(f"Price is near 52-week low ({fifty_two_week_low:.2f}), indicating weakness.")
-            elif position_in_range <= 0.3:
-                score += 5
-                reasons.append(f"Price is in the lower range of 52-week performance ({current_price:.2f}).")
+            ta_score += 5
+            reasons_ta.append(f"Price ({current_price:.2f}) is below key moving averages, indicating bearish pressure.")
+
+        # 52-Week High/Low (weight: 30 points)
+        if fifty_two_week_high and fifty_two_week_low and current_price:
+            price_range = fifty_two_week_high - fifty_two_week_low
+            if price_range > 0:
+                position_in_range = (current_price - fifty_two_week_low) / price_range
+                points, reason = _score_tier(_RANGE_POSITION_TIERS, position_in_range,
+                                             price=current_price, high=fifty_two_week_high, low=fifty_two_week_low)
+                ta_score += points
+                reasons_ta.append(reason)
             else:
-                score += 10
-                reasons.append(f"Price is in the mid-range of its 52-week performance ({current_price:.2f}).")
+                reasons_ta.append("52-week high and low are too close or invalid for range analysis.")
         else:
-            reasons.append("52-week high and low are too close or invalid for range analysis.")
-    else:
-        reasons.append("52-Week High/Low data not available for range analysis.")
+            reasons_ta.append("52-Week High/Low data not available for range analysis.")
 
-    # Recent Price Performance (e.g., last month, weight: 30 points)
-    if len(df) >= 20: # Approx one month of trading days
-        start_price = df['Close'].iloc[-20] # Price 20 trading days ago
-        end_price = df['Close'].iloc[-1] # Current last close in historical data
+        # Recent Price Performance (e.g., last month, weight: 30 points)
+        start_price = tech_features['close20DaysAgo'] # Price 20 trading days ago
+        end_price = tech_features['lastClose'] # Current last close in historical data
         if start_price != 0:
             recent_change = (end_price - start_price) / start_price
-            if recent_change >= 0.05: # Gained 5% or more
-                score += 30
-                reasons.append(f"Strong recent performance: Price up {(recent_change * 100):.2f}% over the last month.")
-            elif recent_change >= 0.01: # Gained 1-5%
-                score += 20
-                reasons.append(f"Positive recent performance: Price up {(recent_change * 100):.2f}% over the last month.")
-            elif recent_change <= -0.05: # Lost 5% or more
-                score += 0
-                reasons.append(f"Weak recent performance: Price down {(abs(recent_change) * 100):.2f}% over the last month.")
-            elif recent_change < 0: # Lost up to 5%
-                score += 10
-                reasons.append(f"Slightly negative recent performance: Price down {(abs(recent_change) * 100):.2f}% over the last month.")
-            else:
-                score += 15
-                reasons.append("Stable recent performance over the last month.")
+            points, reason = _score_tier(_RECENT_CHANGE_TIERS, recent_change)
+            ta_score += points
+            reasons_ta.append(reason)
         else:
-            reasons.append("Cannot calculate recent performance due to zero starting price.")
-    else:
-        reasons.append("Insufficient data for recent price performance analysis (less than 1 month).")
-    
-    final_score = int(min(100, score))
-    if not reasons: reasons.append("Limited technical data available for comprehensive analysis.")
-    return final_score, reasons
+            reasons_ta.append("Cannot calculate recent performance due to zero starting price.")
+
+    technical_analysis_score = int(min(100, ta_score))
+
+    score_breakdown = {
+        'analystRating': analyst_rating_score,
+        'analystUpside': analyst_upside_score,
+        'financialAnalysis': financial_analysis_score,
+        'technicalAnalysis': technical_analysis_score,
+    }
+    upside_text = f"{(analyst_upside * 100):.2f}%" if upside_ok else "N/A"
+    reasons = [
+        f"Analyst Rating: {analyst_recommendation} - {reason_ar} (Score: {analyst_rating_score}%)",
+        f"Analyst Upside: {upside_text} - {reason_au} (Score: {analyst_upside_score}%)",
+        f"Financial Analysis: {'; '.join(reasons_fa)} (Score: {financial_analysis_score}%)",
+        f"Technical Analysis: {'; '.join(reasons_ta)} (Score: {technical_analysis_score}%)",
+    ]
+    return score_breakdown, reasons
 
 
 def calculate_overall_score_and_reasons(stock_data):
@@ -457,42 +785,14 @@ def calculate_overall_score_and_reasons(stock_data):
     Calculates overall score, individual metric scores, and reasons for recommendation.
     Applies weights: 25% for Analyst Rating, 25% for Analyst Upside, 25% for Financial, 25% for Technical.
     """
-    overall_score = 0
-    detailed_reasons = [] # List of reasons with scores
-    score_breakdown = {}
-
-    # 1. Analyst Rating Score
-    analyst_recommendation = stock_data.get('analystRecommendation')
-    analyst_rating_score, reason_ar = calculate_analyst_rating_score(analyst_recommendation)
-    score_breakdown['analystRating'] = analyst_rating_score
-    detailed_reasons.append(f"Analyst Rating: {analyst_recommendation} - {reason_ar} (Score: {analyst_rating_score}%)")
-
-    # 2. Analyst Upside Score
-    analyst_upside = stock_data.get('analystUpside')
-    analyst_upside_score, reason_au = calculate_analyst_upside_score(analyst_upside)
-    score_breakdown['analystUpside'] = analyst_upside_score
-    detailed_reasons.append(f"Analyst Upside: {(analyst_upside * 100):.2f}% - {reason_au} (Score: {analyst_upside_score}%)")
-
-    # 3. Financial Analysis Score
-    financial_analysis_score, reason_fa = calculate_financial_analysis_score(stock_data)
-    score_breakdown['financialAnalysis'] = financial_analysis_score
-    detailed_reasons.append(f"Financial Analysis: {'; '.join(reason_fa)} (Score: {financial_analysis_score}%)")
-
-    # 4. Technical Analysis Score
-    historical_data = stock_data.get('historicalData', [])
-    current_price = stock_data.get('currentPrice')
-    fifty_two_week_high = stock_data.get('52WeekHigh')
-    fifty_two_week_low = stock_data.get('52WeekLow')
-    technical_analysis_score, reason_ta = calculate_technical_analysis_score(historical_data, current_price, fifty_two_week_high, fifty_two_week_low)
-    score_breakdown['technicalAnalysis'] = technical_analysis_score
-    detailed_reasons.append(f"Technical Analysis: {'; '.join(reason_ta)} (Score: {technical_analysis_score}%)")
+    score_breakdown, detailed_reasons = score_all(stock_data)
 
     # Calculate Overall Score with 25% weighting for each category
     overall_score = (
-        analyst_rating_score * 0.25 +
-        analyst_upside_score * 0.25 +
-        financial_analysis_score * 0.25 +
-        technical_analysis_score * 0.25
+        score_breakdown['analystRating'] * 0.25 +
+        score_breakdown['analystUpside'] * 0.25 +
+        score_breakdown['financialAnalysis'] * 0.25 +
+        score_breakdown['technicalAnalysis'] * 0.25
     )
 
     stock_data['overallScore'] = int(round(overall_score, 0)) # Round to nearest integer
@@ -539,11 +839,12 @@ def add_to_watchlist_api():
         return jsonify({"error": "Ticker not provided"}), 400
 
     ticker = ticker.upper()
-    watchlist = load_watchlist()
-    if ticker not in watchlist:
-        watchlist.append(ticker)
-        save_watchlist(watchlist)
-        return jsonify({"message": f"{ticker} added to watchlist successfully."}), 200
+    with _watchlist_lock:
+        watchlist = load_watchlist()
+        if ticker not in watchlist:
+            watchlist.append(ticker)
+            save_watchlist(watchlist)
+            return jsonify({"message": f"{ticker} added to watchlist successfully."}), 200
     return jsonify({"error": f"{ticker} is already in the watchlist."}), 409
 
 @app.route('/api/watchlist', methods=['DELETE'])
@@ -554,11 +855,12 @@ def remove_from_watchlist_api():
         return jsonify({"error": "Ticker not provided"}), 400
 
     ticker = ticker.upper()
-    watchlist = load_watchlist()
-    if ticker in watchlist:
-        watchlist.remove(ticker)
-        save_watchlist(watchlist)
-        return jsonify({"message": f"{ticker} removed from watchlist successfully."}), 200
+    with _watchlist_lock:
+        watchlist = load_watchlist()
+        if ticker in watchlist:
+            watchlist.remove(ticker)
+            save_watchlist(watchlist)
+            return jsonify({"message": f"{ticker} removed from watchlist successfully."}), 200
     return jsonify({"error": f"{ticker} not found in watchlist."}), 404
 
 @app.route('/api/default_stocks', methods=['GET'])
@@ -569,6 +871,10 @@ def get_default_stocks_api():
         "index_funds": index_funds
     })
 
+def _fetch_failure(ticker_symbol, errors):
+    """Builds the error fields returned for a ticker whose data could not be fetched."""
+    return {"success": False, "error": f"Failed to retrieve data for {ticker_symbol}. It might be an invalid ticker or data is temporarily unavailable. Detailed errors: {'; '.join(errors)}", "detailedErrors": errors}
+
 @app.route('/api/stock_data', methods=['GET'])
 def get_stock_data_api():
     ticker_symbol = request.args.get('ticker')
@@ -578,23 +884,44 @@ def get_stock_data_api():
     stock_data, errors = fetch_stock_data_from_yfinance(ticker_symbol)
 
     if stock_data:
-        # Calculate overall score, individual metric scores, and reasons
-        analyzed_stock_data = calculate_overall_score_and_reasons(stock_data)
-        return jsonify({"success": True, "stockData": analyzed_stock_data, "errors": errors if errors else None})
+        # stock_data already carries the overall score, individual metric scores, and reasons
+        return jsonify({"success": True, "stockData": stock_data, "errors": errors if errors else None})
     else:
-        return jsonify({"success": False, "error": f"Failed to retrieve data for {ticker_symbol}. It might be an invalid ticker or data is temporarily unavailable. Detailed errors: {'; '.join(errors)}", "detailedErrors": errors}), 404
+        return jsonify(_fetch_failure(ticker_symbol, errors)), 404
+
+@app.route('/api/stock_data_batch', methods=['GET'])
+def get_stock_data_batch_api():
+    tickers_param = request.args.get('tickers', '')
+    # Comma-separated list; drop blanks and duplicates while keeping the requested order
+    tickers = list(dict.fromkeys(t.strip() for t in tickers_param.split(',') if t.strip()))
+    if not tickers:
+        return jsonify({"success": False, "error": "At least one ticker symbol is required."}), 400
+    if len(tickers) > MAX_BATCH_TICKERS:
+        return jsonify({"success": False, "error": f"Too many tickers: at most {MAX_BATCH_TICKERS} per request."}), 400
+
+    # One batched history download plus concurrent info fetches; the shared rate limiter still spaces out the yfinance calls
+    fetched = fetch_many_from_yfinance(tickers)
+
+    results = []
+    for ticker_symbol, (stock_data, errors) in zip(tickers, fetched):
+        if stock_data:
+            results.append({"ticker": ticker_symbol, "success": True, "stockData": stock_data, "errors": errors if errors else None})
+        else:
+            results.append({"ticker": ticker_symbol, **_fetch_failure(ticker_symbol, errors)})
+    return jsonify({"success": True, "results": results})
 
 if __name__ == '__main__':
     # Ensure watchlist.json and default_stocks.json exist on startup
     if not os.path.exists(WATCHLIST_FILE):
         save_watchlist([])
     if not os.path.exists(DEFAULT_STOCKS_FILE):
-        with open(DEFAULT_STOCKS_FILE, 'w') as f:
-            json.dump({
+        with open(DEFAULT_STOCKS_FILE, 'wb') as f:
+            f.write(orjson.dumps({
                 "companies": DEFAULT_COMPANY_TICKERS,
                 "index_funds": DEFAULT_INDEX_FUNDS
-            }, f, indent=4)
+            }, option=orjson.OPT_INDENT_2))
 
     est_time = get_current_est_time()
     logging.info(f"Flask server starting. Current EST time: {est_time.strftime('%Y-%m-%d %H:%M:%S %Z%z')}")
+    # Development server only; in production run under gunicorn (see Procfile)
     app.run(port=5002, debug=True, use_reloader=False) # use_reloader=False recommended for some environments
\ No newline at end of file
@@ -3,6 +3,9 @@
 // Define the Flask API URL. Using 127.0.0.1 explicitly for clarity.
 const FLASK_API_URL = 'http://127.0.0.1:5002/api';
 
+// Maximum tickers per /stock_data_batch request (matches MAX_BATCH_TICKERS in app.py)
+const MAX_BATCH_TICKERS = 50;
+
 // Global variable to hold the chart instance
 let historicalPriceChart;
 
@@ -311,6 +314,26 @@ document.addEventListener('DOMContentLoaded', async () => {
 
     // --- Analysis Functions ---
 
+    /**
+     * Builds the standardized error object shown in place of a stock's analysis when it could not be fetched.
+     * @param {string} ticker - The stock ticker symbol.
+     * @param {string} error - The error message.
+     * @param {string} reason - The line shown in the stock's reasons list.
+     * @returns {object} An object with the same display fields as a successful analysis.
+     */
+    function makeAnalysisErrorObject(ticker, error, reason) {
+        return { 
+            ticker: ticker, 
+            error: error, 
+            companyName: 'N/A', 
+            currentPrice: 'N/A', 
+            overallScore: 'N/A', 
+            suggestion: 'Analysis Error',
+            reasons: [reason],
+            percentChange: 'N/A' // Ensure this is present for dashboard display
+        };
+    }
+
     /**
      * Fetches analysis for a single stock. This is the core call to the /api/stock_data endpoint.
      * @param {string} ticker - The stock ticker symbol.
@@ -325,29 +348,41 @@ document.addEventListener('DOMContentLoaded', async () => {
             } else {
                 console.error(`Error fetching data for ${ticker}:`, result.error);
                 // Return a standardized error object for consistent display
-                return { 
-                    ticker: ticker, 
-                    error: result.error, 
-                    companyName: 'N/A', 
-                    currentPrice: 'N/A', 
-                    overallScore: 'N/A', 
-                    suggestion: 'Analysis Error',
-                    reasons: [`Error: ${result.error || 'Could not fetch data.'}`],
-                    percentChange: 'N/A' // Ensure this is present for dashboard display
-                };
+                return makeAnalysisErrorObject(ticker, result.error, `Error: ${result.error || 'Could not fetch data.'}`);
             }
         } catch (error) {
             console.error(`Network error fetching data for ${ticker}:`, error);
-            return { 
-                ticker: ticker, 
-                error: `Network error: ${error.message}`, 
-                companyName: 'N/A', 
-                currentPrice: 'N/A', 
-                overallScore: 'N/A', 
-                suggestion: 'Analysis Error',
-                reasons: [`Network error: ${error.message}`],
-                percentChange: 'N/A' // Ensure this is present for dashboard display
-            };
+            return makeAnalysisErrorObject(ticker, `Network error: ${error.message}`, `Network error: ${error.message}`);
+        }
+    }
+
+    /**
+     * Fetches analysis for several stocks in one call to the /api/stock_data_batch endpoint.
+     * The backend fetches the tickers concurrently, so this is much faster than one request per ticker.
+     * @param {string[]} tickers - The stock ticker symbols.
+     * @returns {Promise<object[]>} Stock data objects (or standardized error objects), in the same order as tickers.
+     */
+    async function fetchBatchStockAnalysis(tickers) {
+        if (tickers.length === 0) {
+            return [];
+        }
+        try {
+            const response = await fetch(`${FLASK_API_URL}/stock_data_batch?tickers=${encodeURIComponent(tickers.join(','))}`);
+            const result = await response.json();
+            if (!result.success) {
+                throw new Error(result.error || 'Batch analysis request failed.');
+            }
+            return result.results.map(item => {
+                if (item.success) {
+                    return item.stockData;
+                }
+                console.error(`Error fetching data for ${item.ticker}:`, item.error);
+                // Return a standardized error object for consistent display
+                return makeAnalysisErrorObject(item.ticker, item.error, `Error: ${item.error || 'Could not fetch data.'}`);
+            });
+        } catch (error) {
+            console.error('Network error fetching batch analysis:', error);
+            return tickers.map(ticker => makeAnalysisErrorObject(ticker, `Network error: ${error.message}`, `Network error: ${error.message}`));
         }
     }
 
@@ -376,8 +411,12 @@ document.addEventListener('DOMContentLoaded', async () => {
             }
 
             const allTickersToAnalyze = Array.from(new Set([...watchlist, ...defaultStocks]));
-            const analysisPromises = allTickersToAnalyze.map(ticker => fetchStockAnalysis(ticker));
-            const allAnalyzedData = await Promise.all(analysisPromises);
+            // Split into requests the batch endpoint accepts, sent one after another so the backend's
+            // rate limiter isn't hit with several batches at once; results keep the original ticker order
+            const allAnalyzedData = [];
+            for (let i = 0; i < allTickersToAnalyze.length; i += MAX_BATCH_TICKERS) {
+                allAnalyzedData.push(...await fetchBatchStockAnalysis(allTickersToAnalyze.slice(i, i + MAX_BATCH_TICKERS)));
+            }
 
             const longTermPicks = [];
             const shortTermPicks = [];
@@ -583,7 +622,8 @@ document.addEventListener('DOMContentLoaded', async () => {
 
     /**
      * Renders or updates the historical price chart using Chart.js.
-     * @param {Array<Object>} historicalData - Array of historical price objects.
+     * @param {Object<string, Array>} historicalData - Columnar historical prices: parallel arrays keyed by column (DateEpoch, Open, High, Low, Close, Volume).
+     *   DateEpoch holds each trading date as Unix seconds at UTC midnight.
      * @param {string} ticker - The stock ticker symbol.
      */
     function renderHistoricalChart(historicalData, ticker) {
@@ -594,7 +634,7 @@ document.addEventListener('DOMContentLoaded', async () => {
             historicalPriceChart = null; // IMPORTANT: Clear the reference after destroying
         }
 
-        if (!historicalData || historicalData.length === 0) {
+        if (!historicalData || !Array.isArray(historicalData.DateEpoch) || historicalData.DateEpoch.length === 0) {
             ctx.clearRect(0, 0, ctx.canvas.width, ctx.canvas.height);
             // Optionally, display a message directly on the canvas area
             ctx.font = '16px Arial';
@@ -604,11 +644,9 @@ document.addEventListener('DOMContentLoaded', async () => {
             return;
         }
 
-        // Sort data by date just in case
-        historicalData.sort((a, b) => new Date(a.Date) - new Date(b.Date));
-
-        const dates = historicalData.map(data => data.Date);
-        const closingPrices = historicalData.map(data => data.Close);
+        // Columns arrive in chronological order, so they can feed the chart directly
+        const dates = historicalData.DateEpoch.map(seconds => seconds * 1000); // Chart.js time scale expects milliseconds
+        const closingPrices = historicalData.Close;
 
         historicalPriceChart = new Chart(ctx, {
             type: 'line',
@@ -648,6 +686,11 @@ document.addEventListener('DOMContentLoaded', async () => {
                 scales: {
                     x: {
                         type: 'time',
+                        adapters: {
+                            date: {
+                                zone: 'UTC' // Dates are UTC-midnight timestamps; show them without shifting to local time
+                            }
+                        },
                         time: {
                             unit: 'month',
                             tooltipFormat: 'MMM DD, YYYY',